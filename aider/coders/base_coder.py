@@ -12,7 +12,6 @@ from pathlib import Path
 
 import git
 import openai
-from jsonschema import Draft7Validator
 from rich.console import Console, Text
 from rich.markdown import Markdown
 
@@ -124,6 +123,9 @@ class Coder:
         self.chat_completion_call_hashes = []
         self.chat_completion_response_hashes = []
         self.need_commit_before_edits = set()
+        self.file_content_cache = dict()
+        self.system_prompt_cache = dict()
+        self.files_content_cache = None
 
         self.verbose = verbose
         self.abs_fnames = set()
@@ -233,6 +235,9 @@ class Coder:
 
         # validate the functions jsonschema
         if self.functions:
+            # only the function calling coders need jsonschema
+            from jsonschema import Draft7Validator
+
             for function in self.functions:
                 Draft7Validator.check_schema(function)
 
@@ -278,9 +283,49 @@ class Coder:
 
         return True
 
+    def read_fname_content(self, fname):
+        """Read fname with io.read_text, reusing the last read while its mtime and size match"""
+        try:
+            st = os.stat(fname)
+            key = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+
+        cached = self.file_content_cache.get(fname)
+        if key and cached and cached[0] == key:
+            return cached[1]
+
+        content = self.io.read_text(fname)
+        if key and content is not None:
+            self.file_content_cache[fname] = (key, content)
+        else:
+            self.file_content_cache.pop(fname, None)
+
+        return content
+
+    def write_fname_content(self, fname, content):
+        """Write fname with io.write_text, and remember content so it needn't be read back"""
+        self.io.write_text(fname, content)
+
+        if self.io.dry_run:
+            self.file_content_cache.pop(fname, None)
+            return
+
+        try:
+            st = os.stat(fname)
+        except OSError:
+            self.file_content_cache.pop(fname, None)
+            return
+
+        self.file_content_cache[fname] = ((st.st_mtime_ns, st.st_size), content)
+
     def get_abs_fnames_content(self):
+        # forget files which have been dropped from the chat
+        for fname in set(self.file_content_cache) - self.abs_fnames:
+            del self.file_content_cache[fname]
+
         for fname in list(self.abs_fnames):
-            content = self.io.read_text(fname)
+            content = self.read_fname_content(fname)
 
             if content is None:
                 relative_fname = self.get_rel_fname(fname)
@@ -290,9 +335,7 @@ class Coder:
                 yield fname, content
 
     def choose_fence(self):
-        all_content = ""
-        for _fname, content in self.get_abs_fnames_content():
-            all_content += content + "\n"
+        all_content = "\n".join(content for _fname, content in self.get_abs_fnames_content())
 
         good = False
         for fence_open, fence_close in self.fences:
@@ -316,21 +359,39 @@ class Coder:
         if not fnames:
             fnames = self.abs_fnames
 
-        prompt = ""
-        for fname, content in self.get_abs_fnames_content():
-            if not is_image_file(fname):
-                relative_fname = self.get_rel_fname(fname)
-                prompt += "\n"
-                prompt += relative_fname
-                prompt += f"\n{self.fence[0]}\n"
+        files = [
+            (fname, content)
+            for fname, content in self.get_abs_fnames_content()
+            if not is_image_file(fname)
+        ]
 
-                prompt += content
+        # reuse the last prompt if the fence and every file's (mtime, size) are unchanged
+        key = [self.fence]
+        for fname, _content in files:
+            cached = self.file_content_cache.get(fname)
+            if not cached:
+                key = None
+                break
+            key.append((fname, cached[0]))
+
+        if key and self.files_content_cache and self.files_content_cache[0] == key:
+            return self.files_content_cache[1]
+
+        prompt = []
+        for fname, content in files:
+            relative_fname = self.get_rel_fname(fname)
+            prompt += ["\n", relative_fname, f"\n{self.fence[0]}\n"]
 
-                # lines = content.splitlines(keepends=True)
-                # lines = [f"{i+1:03}:{line}" for i, line in enumerate(lines)]
-                # prompt += "".join(lines)
+            prompt.append(content)
 
-                prompt += f"{self.fence[1]}\n"
+            # lines = content.splitlines(keepends=True)
+            # lines = [f"{i+1:03}:{line}" for i, line in enumerate(lines)]
+            # prompt += "".join(lines)
+
+            prompt.append(f"{self.fence[1]}\n")
+
+        prompt = "".join(prompt)
+        self.files_content_cache = (key, prompt) if key else None
 
         return prompt
 
@@ -484,13 +545,17 @@ class Coder:
         return self.send_new_user_message(inp)
 
     def fmt_system_prompt(self, prompt):
-        prompt = prompt.format(fence=self.fence)
-        return prompt
+        # the prompts are static, they only need formatting again if the fence changes
+        key = (prompt, self.fence)
+        if key not in self.system_prompt_cache:
+            self.system_prompt_cache[key] = prompt.format(fence=self.fence)
+        return self.system_prompt_cache[key]
 
     def format_messages(self):
         self.choose_fence()
+        system_reminder = self.fmt_system_prompt(self.gpt_prompts.system_reminder)
         main_sys = self.fmt_system_prompt(self.gpt_prompts.main_system)
-        main_sys += "\n" + self.fmt_system_prompt(self.gpt_prompts.system_reminder)
+        main_sys += "\n" + system_reminder
 
         messages = [
             dict(role="system", content=main_sys),
@@ -501,7 +566,7 @@ class Coder:
         messages += self.get_files_messages()
 
         reminder_message = [
-            dict(role="system", content=self.fmt_system_prompt(self.gpt_prompts.system_reminder)),
+            dict(role="system", content=system_reminder),
         ]
 
         # TODO review impact of token count on image messages
@@ -749,29 +814,24 @@ class Coder:
                 if len(chunk.choices) == 0:
                     continue
 
-                if (
-                    hasattr(chunk.choices[0], "finish_reason")
-                    and chunk.choices[0].finish_reason == "length"
-                ):
+                if getattr(chunk.choices[0], "finish_reason", None) == "length":
                     raise ExhaustedContextWindow()
 
-                try:
-                    func = chunk.choices[0].delta.function_call
+                # most chunks lack one of these, so check rather than catch AttributeError
+                delta = getattr(chunk.choices[0], "delta", None)
+
+                func = getattr(delta, "function_call", None)
+                if func is not None and hasattr(func, "items"):
                     # dump(func)
                     for k, v in func.items():
                         if k in self.partial_response_function_call:
                             self.partial_response_function_call[k] += v
                         else:
                             self.partial_response_function_call[k] = v
-                except AttributeError:
-                    pass
 
-                try:
-                    text = chunk.choices[0].delta.content
-                    if text:
-                        self.partial_response_content += text
-                except AttributeError:
-                    text = None
+                text = getattr(delta, "content", None)
+                if text:
+                    self.partial_response_content += text
 
                 if self.show_pretty():
                     self.live_incremental_response(mdstream, False)
@@ -783,6 +843,10 @@ class Coder:
                 self.live_incremental_response(mdstream, True)
 
     def live_incremental_response(self, mdstream, final):
+        # don't bother rendering the response if mdstream would just discard it
+        if not final and mdstream.throttled():
+            return
+
         show_resp = self.render_incremental_response(final)
         if not show_resp:
             return
@@ -805,7 +869,8 @@ class Coder:
         else:
             files = self.get_inchat_relative_files()
 
-        files = [fname for fname in files if Path(self.abs_root_path(fname)).is_file()]
+        # self.root is already resolved, so skip resolving each path just to check it is a file
+        files = [fname for fname in files if os.path.isfile(os.path.join(self.root, fname))]
         return sorted(set(files))
 
     def get_all_abs_files(self):
@@ -900,7 +965,7 @@ class Coder:
             relative_fname = self.get_rel_fname(fname)
             if is_image_file(relative_fname):
                 continue
-            content = self.io.read_text(fname)
+            content = self.read_fname_content(fname)
             tokens += self.main_model.token_count(content)
 
         if tokens < warn_number_of_tokens:
@@ -1017,12 +1082,12 @@ class Coder:
     # commits...
 
     def get_context_from_history(self, history):
-        context = ""
+        context = []
         if history:
             for msg in history:
-                context += "\n" + msg["role"].upper() + ": " + msg["content"] + "\n"
+                context.append("\n" + msg["role"].upper() + ": " + msg["content"] + "\n")
 
-        return context
+        return "".join(context)
 
     def auto_commit(self, edited):
         context = self.get_context_from_history(self.cur_messages)
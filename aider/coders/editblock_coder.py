@@ -26,10 +26,10 @@ class EditBlockCoder(Coder):
     def apply_edits(self, edits):
         for path, original, updated in edits:
             full_path = self.abs_root_path(path)
-            content = self.io.read_text(full_path)
+            content = self.read_fname_content(full_path)
             content = do_replace(full_path, content, original, updated, self.fence)
             if content:
-                self.io.write_text(full_path, content)
+                self.write_fname_content(full_path, content)
                 continue
             raise ValueError(f"""InvalidEditBlock: edit failed!
 
@@ -63,6 +63,18 @@ def perfect_or_whitespace(whole_lines, part_lines, replace_lines):
         return res
 
 
+def exact_replace(whole, part, replace):
+    """Replace the first line-aligned occurrence of `part`, found with str.find"""
+    idx = whole.find(part)
+    while idx > 0 and whole[idx - 1] != "\n":
+        idx = whole.find(part, idx + 1)
+
+    if idx == -1:
+        return
+
+    return whole[:idx] + replace + whole[idx + len(part) :]
+
+
 def perfect_replace(whole_lines, part_lines, replace_lines):
     part_tup = tuple(part_lines)
     part_len = len(part_lines)
@@ -81,6 +93,11 @@ def replace_most_similar_chunk(whole, part, replace):
     part, part_lines = prep(part)
     replace, replace_lines = prep(replace)
 
+    # Fast path for the common case of an exact match, same result as perfect_replace()
+    res = exact_replace(whole, part, replace)
+    if res:
+        return res
+
     res = perfect_or_whitespace(whole_lines, part_lines, replace_lines)
     if res:
         return res
@@ -266,15 +283,24 @@ def strip_quoted_wrapping(res, fname=None, fence=DEFAULT_FENCE):
     if not res:
         return res
 
-    res = res.splitlines()
+    # files are read with universal newlines
+    if "\r" in res:
+        res = res.replace("\r\n", "\n").replace("\r", "\n")
 
-    if fname and res[0].strip().endswith(Path(fname).name):
-        res = res[1:]
+    # only the first and last lines matter, so slice them off rather than splitting every line
+    if res.endswith("\n"):
+        res = res[:-1]
 
-    if res[0].startswith(fence[0]) and res[-1].startswith(fence[1]):
-        res = res[1:-1]
+    first_line, _, rest = res.partition("\n")
+    if fname and first_line.strip().endswith(Path(fname).name):
+        res = rest
+        first_line, _, rest = res.partition("\n")
+
+    last_line = res[res.rfind("\n") + 1 :]
+    if first_line.startswith(fence[0]) and last_line.startswith(fence[1]):
+        last_eol = rest.rfind("\n")
+        res = rest[:last_eol] if last_eol != -1 else ""
 
-    res = "\n".join(res)
     if res and res[-1] != "\n":
         res += "\n"
 
@@ -307,9 +333,10 @@ HEAD = "<<<<<<< SEARCH"
 DIVIDER = "======="
 UPDATED = ">>>>>>> REPLACE"
 
-separators = "|".join([HEAD, DIVIDER, UPDATED])
+markers = (HEAD, DIVIDER, UPDATED)
 
-split_re = re.compile(r"^((?:" + separators + r")[ ]*\n)", re.MULTILINE | re.DOTALL)
+# Anchored to the start of a line and matches literal text, so it never backtracks.
+marker_re = re.compile(r"^(?:" + "|".join(markers) + r")[ ]*\n", re.MULTILINE)
 
 
 missing_filename_err = f"Bad/missing filename. Filename should be alone on the line before {HEAD}"
@@ -328,76 +355,67 @@ def strip_filename(filename, fence):
     return filename
 
 
+def find_filename(text, fence):
+    """Look for the filename on the last, or next to last, line before the SEARCH marker"""
+    for line in reversed(text.splitlines()[-2:]):
+        filename = strip_filename(line, fence)
+        if filename:
+            return filename
+
+
 def find_original_update_blocks(content, fence=DEFAULT_FENCE):
-    # make sure we end with a newline, otherwise the regex will miss <<UPD on the last line
+    # make sure we end with a newline, otherwise the regex will miss the marker on the last line
     if not content.endswith("\n"):
         content = content + "\n"
 
-    pieces = re.split(split_re, content)
-
-    pieces.reverse()
-    processed = []
-
     # Keep using the same filename in cases where GPT produces an edit block
     # without a filename.
     current_filename = None
-    try:
-        while pieces:
-            cur = pieces.pop()
-
-            if cur in (DIVIDER, UPDATED):
-                processed.append(cur)
-                raise ValueError(f"Unexpected {cur}")
 
-            if cur.strip() != HEAD:
-                processed.append(cur)
-                continue
+    # Single forward pass over the marker lines. `expect` is the next marker we need to see,
+    # and the text between markers is sliced straight out of content.
+    expect = HEAD
+    start = 0
+    end = 0
+    try:
+        for match in marker_re.finditer(content):
+            text = content[start : match.start()]
+            marker = match.group().rstrip()
+            start = end = match.end()
 
-            processed.append(cur)  # original_marker
+            if expect == HEAD:
+                if marker != HEAD:
+                    # a stray divider or updated marker outside of an edit block
+                    continue
 
-            filename = strip_filename(processed[-2].splitlines()[-1], fence)
-            try:
-                if not filename:
-                    filename = strip_filename(processed[-2].splitlines()[-2], fence)
+                filename = find_filename(text, fence) or current_filename
                 if not filename:
-                    if current_filename:
-                        filename = current_filename
-                    else:
-                        raise ValueError(missing_filename_err)
-            except IndexError:
-                if current_filename:
-                    filename = current_filename
-                else:
                     raise ValueError(missing_filename_err)
 
-            current_filename = filename
-
-            original_text = pieces.pop()
-            processed.append(original_text)
-
-            divider_marker = pieces.pop()
-            processed.append(divider_marker)
-            if divider_marker.strip() != DIVIDER:
-                raise ValueError(f"Expected `{DIVIDER}` not {divider_marker.strip()}")
+                current_filename = filename
+                expect = DIVIDER
+            elif expect == DIVIDER:
+                if marker != DIVIDER:
+                    raise ValueError(f"Expected `{DIVIDER}` not {marker}")
 
-            updated_text = pieces.pop()
-            processed.append(updated_text)
+                original_text = text
+                expect = UPDATED
+            else:
+                if marker != UPDATED:
+                    raise ValueError(f"Expected `{UPDATED}` not `{marker}")
 
-            updated_marker = pieces.pop()
-            processed.append(updated_marker)
-            if updated_marker.strip() != UPDATED:
-                raise ValueError(f"Expected `{UPDATED}` not `{updated_marker.strip()}")
+                yield filename, original_text, text
+                expect = HEAD
 
-            yield filename, original_text, updated_text
+        if expect != HEAD:
+            end = len(content)
+            raise ValueError("Incomplete SEARCH/REPLACE block.")
     except ValueError as e:
-        processed = "".join(processed)
+        processed = content[:end]
         err = e.args[0]
         raise ValueError(f"{processed}\n^^^ {err}")
-    except IndexError:
-        processed = "".join(processed)
-        raise ValueError(f"{processed}\n^^^ Incomplete SEARCH/REPLACE block.")
     except Exception:
-        processed = "".join(processed)
+        processed = content[:end]
         raise ValueError(f"{processed}\n^^^ Error parsing SEARCH/REPLACE block.")
 
 
@@ -87,7 +87,7 @@ class UnifiedDiffCoder(Coder):
         errors = []
         for path, hunk in uniq:
             full_path = self.abs_root_path(path)
-            content = self.io.read_text(full_path)
+            content = self.read_fname_content(full_path)
 
             original, _ = hunk_to_before_after(hunk)
 
@@ -110,7 +110,7 @@ class UnifiedDiffCoder(Coder):
                 continue
 
             # SUCCESS!
-            self.io.write_text(full_path, content)
+            self.write_fname_content(full_path, content)
 
         if errors:
             errors = "\n\n".join(errors)
@@ -6,8 +6,7 @@ from pathlib import Path
 import git
 from prompt_toolkit.completion import Completion
 
-from aider import prompts, voice
-from aider.scrape import Scraper
+from aider import prompts
 from aider.utils import is_gpt4_with_openai_base_url, is_image_file
 
 from .dump import dump  # noqa: F401
@@ -40,6 +39,9 @@ class Commands:
             return
 
         if not self.scraper:
+            # bs4 and playwright add ~100ms to startup, most sessions never use /web
+            from aider.scrape import Scraper
+
             self.scraper = Scraper(print_error=self.io.tool_error)
 
         content = self.scraper.scrape(url) or ""
@@ -548,6 +550,9 @@ class Commands:
         "Record and transcribe voice input"
 
         if not self.voice:
+            # defer importing numpy until /voice is actually used
+            from aider import voice
+
             try:
                 self.voice = voice.Voice(self.coder.client)
             except voice.SoundDeviceError:
@@ -1,4 +1,7 @@
+import atexit
 import os
+import queue
+import threading
 from collections import defaultdict
 from datetime import datetime
 import base64
@@ -126,10 +129,20 @@ class InputOutput:
 
         self.input_history_file = input_history_file
         if chat_history_file is not None:
-            self.chat_history_file = Path(chat_history_file)
+            # resolve now, the writer thread may run after the cwd has changed
+            self.chat_history_file = Path(chat_history_file).resolve()
         else:
             self.chat_history_file = None
 
+        # Appends to the chat history file happen on a background thread,
+        # so slow disks don't hold up the chat. They are flushed at exit.
+        self.chat_history_queue = None
+        self.chat_history_error = None
+        if self.chat_history_file is not None:
+            self.chat_history_queue = queue.Queue()
+            threading.Thread(target=self.chat_history_writer, daemon=True).start()
+            atexit.register(self.flush_chat_history)
+
         self.encoding = encoding
         self.dry_run = dry_run
 
@@ -363,9 +376,56 @@ class InputOutput:
             text = text + "  \n"
         if not text.endswith("\n"):
             text += "\n"
-        if self.chat_history_file is not None:
+        if self.chat_history_queue is not None:
+            self.raise_chat_history_error()
+            self.chat_history_queue.put(text)
+
+    def chat_history_writer(self):
+        while True:
+            texts = [self.chat_history_queue.get()]
+
+            # write everything that queued up while we were busy in one go
+            while True:
+                try:
+                    texts.append(self.chat_history_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self.write_chat_history(texts)
+            finally:
+                for _ in texts:
+                    self.chat_history_queue.task_done()
+
+    def write_chat_history(self, texts):
+        try:
             with self.chat_history_file.open("a", encoding=self.encoding) as f:
-                f.write(text)
+                f.write("".join(texts))
+            return
+        except Exception:
+            pass
+
+        # the batch failed, write the texts one at a time so only the bad ones are lost
+        for text in texts:
+            try:
+                with self.chat_history_file.open("a", encoding=self.encoding) as f:
+                    f.write(text)
+            except Exception as err:
+                if self.chat_history_error is None:
+                    self.chat_history_error = err
+
+    def raise_chat_history_error(self):
+        """Re-raise a failed chat history write in the calling thread"""
+        err = self.chat_history_error
+        if err is not None:
+            self.chat_history_error = None
+            raise err
+
+    def flush_chat_history(self):
+        """Wait for any pending chat history appends to be written"""
+        if self.chat_history_queue is not None:
+            self.chat_history_queue.join()
+            self.raise_chat_history_error()
 
 def read_block():
     import sys
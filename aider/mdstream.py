@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import io
+import re
 import time
 
 from rich.console import Console
@@ -39,6 +40,21 @@ The end.
 
 """  # noqa: E501
 
+# Lines which might be part of a list, quote, code block, table, heading underline, etc.
+# Blocks which start or end with one of these may render differently when split apart.
+joinable_line_re = re.compile(r"[ \t>*+=_\[|<-]|\d+[.)]|```|~~~")
+
+# Lines which open a block that may contain blank lines: code fences, and the html
+# blocks which only end at their closing tag (like aider's own <pre> fence)
+fence_line_re = re.compile(r"[ \t]*(`{3,}|~{3,})(.*)")
+# only a bare fence indented by at most 3 spaces closes one
+fence_close_re = re.compile(r"[ ]{0,3}(`{3,}|~{3,})[ \t]*$")
+html_block_re = re.compile(
+    r"[ \t]*<(?:(?:(pre|script|style|textarea)(?=[\s>]|$))|(!--)|(\?)|(!\[CDATA\[)|(![A-Za-z]))",
+    re.IGNORECASE,
+)
+html_block_ends = (None, "-->", "?>", "]]>", ">")
+
 
 class MarkdownStream:
     live = None
@@ -49,6 +65,16 @@ class MarkdownStream:
     def __init__(self, mdargs=None):
         self.printed = []
 
+        # Complete markdown blocks are rendered once and their output lines kept
+        # in frozen_lines. Only the text after frozen_upto is re-rendered.
+        self.frozen_upto = 0
+        self.frozen_lines = []
+        self.frozen_text = ""
+
+        # The last rendered tail, reused when an update brings no new text
+        self.tail_text = None
+        self.tail_lines = []
+
         if mdargs:
             self.mdargs = mdargs
         else:
@@ -64,12 +90,11 @@ class MarkdownStream:
             except Exception:
                 pass
 
-    def update(self, text, final=False):
-        now = time.time()
-        if not final and now - self.when < self.min_delay:
-            return
-        self.when = now
+    def throttled(self):
+        """Is it too soon since the last update for another one to be shown?"""
+        return time.time() - self.when < self.min_delay
 
+    def render(self, text):
         string_io = io.StringIO()
         console = Console(file=string_io, force_terminal=True)
 
@@ -78,7 +103,114 @@ class MarkdownStream:
         console.print(markdown)
         output = string_io.getvalue()
 
-        lines = output.splitlines(keepends=True)
+        return output.splitlines(keepends=True)
+
+    def freeze(self, text):
+        # the text was changed rather than extended, start over
+        if not text.startswith(self.frozen_text):
+            self.frozen_upto = 0
+            self.frozen_lines = []
+            self.frozen_text = ""
+
+        split = self.find_split(text)
+        if split <= self.frozen_upto:
+            return
+
+        # separately rendered blocks are joined by a blank line, just like rich would
+        self.frozen_lines += self.render(text[self.frozen_upto : split]) + ["\n"]
+        self.frozen_upto = split
+        self.frozen_text = text[:split]
+
+    def find_split(self, text):
+        """
+        Find the last blank line where the markdown before and after it renders the same
+        on its own as it does all together: outside of any code fence or html block, and
+        not between blocks which might be part of the same list, quote, table, etc.
+        """
+        split = self.frozen_upto
+        block_end = None
+        start = self.frozen_upto
+        while True:
+            pos = text.find("\n\n", start)
+            if pos == -1:
+                return split
+
+            for line in text[start:pos].split("\n"):
+                block_end = self.scan_block_line(line, block_end)
+            start = pos + 2
+            if block_end:
+                continue
+
+            # the first line of the next block must be complete
+            eol = text.find("\n", start)
+            if eol == -1:
+                return split
+            first_line = text[start:eol]
+            if not first_line.strip() or joinable_line_re.match(first_line):
+                continue
+            if "|" in first_line:
+                # might be a table
+                continue
+
+            # the first and last lines of the previous block
+            end = pos
+            while end > 0 and text[end - 1] == "\n":
+                end -= 1
+            last_line = text[text.rfind("\n", 0, end) + 1 : end]
+            block_start = text.rfind("\n\n", 0, end)
+            block_start = 0 if block_start == -1 else block_start + 2
+            block_first_line = text[block_start : text.find("\n", block_start)]
+            if not last_line.strip() or joinable_line_re.match(last_line):
+                continue
+            if joinable_line_re.match(block_first_line):
+                continue
+
+            split = start
+
+    def scan_block_line(self, line, block_end):
+        """
+        Track fenced code and html blocks across lines. block_end describes how the
+        currently open block ends, or is None outside of one.
+        """
+        if block_end is None:
+            match = fence_line_re.match(line)
+            # a backtick fence's info string can't contain backticks, that's inline code
+            if match and not (match.group(1)[0] == "`" and "`" in match.group(2)):
+                return ("fence", match.group(1))
+
+            match = html_block_re.match(line)
+            if not match:
+                return None
+            if match.group(1):
+                block_end = ("html", "</" + match.group(1).lower() + ">")
+            else:
+                block_end = ("html", html_block_ends[match.lastindex - 1])
+            line = line[match.end() :]
+
+        kind, end = block_end
+        if kind == "fence":
+            match = fence_close_re.match(line)
+            if match and match.group(1)[0] == end[0] and len(match.group(1)) >= len(end):
+                return None
+            return block_end
+
+        if end in line.lower():
+            return None
+        return block_end
+
+    def update(self, text, final=False):
+        if not final and self.throttled():
+            return
+        self.when = time.time()
+
+        self.freeze(text)
+
+        tail = text[self.frozen_upto :]
+        if tail != self.tail_text:
+            self.tail_text = tail
+            self.tail_lines = self.render(tail)
+
+        lines = self.frozen_lines + self.tail_lines
         num_lines = len(lines)
 
         if not final:
@@ -28,6 +28,7 @@ class GitRepo:
             check_fnames = ["."]
 
         repo_paths = []
+        dname_repo_paths = dict()
         for fname in check_fnames:
             fname = Path(fname)
             fname = fname.resolve()
@@ -35,14 +36,22 @@ class GitRepo:
             if not fname.exists() and fname.parent.exists():
                 fname = fname.parent
 
-            try:
-                repo_path = git.Repo(fname, search_parent_directories=True).working_dir
-                repo_path = utils.safe_abs_path(repo_path)
-                repo_paths.append(repo_path)
-            except git.exc.InvalidGitRepositoryError:
-                pass
-            except git.exc.NoSuchPathError:
-                pass
+            # files in the same dir share a repo, only search upwards once per dir
+            if fname.is_file():
+                fname = fname.parent
+
+            if fname not in dname_repo_paths:
+                dname_repo_paths[fname] = None
+                try:
+                    repo_path = git.Repo(fname, search_parent_directories=True).working_dir
+                    dname_repo_paths[fname] = utils.safe_abs_path(repo_path)
+                except git.exc.InvalidGitRepositoryError:
+                    pass
+                except git.exc.NoSuchPathError:
+                    pass
+
+            if dname_repo_paths[fname]:
+                repo_paths.append(dname_repo_paths[fname])
 
         num_repos = len(set(repo_paths))
 
@@ -60,9 +69,7 @@ class GitRepo:
             self.aider_ignore_file = Path(aider_ignore_file)
 
     def commit(self, fnames=None, context=None, prefix=None, message=None):
-        if not fnames and not self.repo.is_dirty():
-            return
-
+        # a clean tree has no diffs, no need to ask `git` if it's dirty first
         diffs = self.get_diffs(fnames)
         if not diffs:
             return
@@ -85,8 +92,7 @@ class GitRepo:
         cmd = ["-m", full_commit_message, "--no-verify"]
         if fnames:
             fnames = [str(self.abs_root_path(fn)) for fn in fnames]
-            for fname in fnames:
-                self.repo.git.add(fname)
+            self.repo.git.add("--", *fnames)
             cmd += ["--"] + fnames
         else:
             cmd += ["-a"]
@@ -137,19 +143,20 @@ class GitRepo:
 
     def get_diffs(self, fnames=None):
         # We always want diffs of index and working dir
-        try:
-            commits = self.repo.iter_commits(self.repo.active_branch)
-            current_branch_has_commits = any(commits)
-        except git.exc.GitCommandError:
-            current_branch_has_commits = False
+
+        # Resolve HEAD in-process, rather than spawning `git rev-list`
+        current_branch_has_commits = self.repo.head.is_valid()
 
         if not fnames:
             fnames = []
 
         diffs = ""
-        for fname in fnames:
-            if not self.path_in_repo(fname):
-                diffs += f"Added {fname}\n"
+        if fnames:
+            # build the tracked set once, rather than re-walking the tree for every fname
+            tracked_files = set(self.get_tracked_files())
+            for fname in fnames:
+                if self.normalize_path(fname) not in tracked_files:
+                    diffs += f"Added {fname}\n"
 
         if current_branch_has_commits:
             args = ["HEAD", "--"] + list(fnames)
@@ -5,8 +5,6 @@ import sys
 from collections import Counter, defaultdict, namedtuple
 from pathlib import Path
 
-import networkx as nx
-import pkg_resources
 from diskcache import Cache
 from grep_ast import TreeContext, filename_to_lang
 from pygments.lexers import guess_lexer_for_filename
@@ -140,6 +138,8 @@ class RepoMap:
         parser = get_parser(lang)
 
         # Load the tags queries
+        import pkg_resources
+
         scm_fname = pkg_resources.resource_filename(
             __name__, os.path.join("queries", f"tree-sitter-{lang}-tags.scm")
         )
@@ -207,6 +207,8 @@ class RepoMap:
             )
 
     def get_ranked_tags(self, chat_fnames, other_fnames):
+        import networkx as nx  # deferred, it's one of the slowest imports at startup
+
         defines = defaultdict(set)
         references = defaultdict(list)
         definitions = defaultdict(set)
@@ -1,6 +1,7 @@
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import git
@@ -140,6 +141,90 @@ class TestCoder(unittest.TestCase):
         self.assertIn("file1.txt", content)
         self.assertIn("file2.txt", content)
 
+    def test_get_files_content_skips_reading_unchanged_files(self):
+        tempdir = Path(tempfile.mkdtemp())
+
+        file1 = tempdir / "file1.txt"
+        file1.write_text("one\n")
+
+        io = InputOutput()
+        coder = Coder.create(models.GPT4, None, io=io, fnames=[file1])
+
+        with patch.object(io, "read_text", wraps=io.read_text) as mock:
+            self.assertIn("one", coder.get_files_content())
+            self.assertIn("one", coder.get_files_content())
+            self.assertEqual(mock.call_count, 1)
+
+            file1.write_text("changed\n")
+            self.assertIn("changed", coder.get_files_content())
+            self.assertEqual(mock.call_count, 2)
+
+    def test_get_files_content_reuses_unchanged_prompt(self):
+        tempdir = Path(tempfile.mkdtemp())
+
+        file1 = tempdir / "file1.txt"
+        file1.write_text("one\n")
+
+        coder = Coder.create(models.GPT4, None, io=InputOutput(), fnames=[file1])
+
+        content = coder.get_files_content()
+        self.assertIs(coder.get_files_content(), content)
+
+        coder.fence = ("<source>", "</source>")
+        content = coder.get_files_content()
+        self.assertIn("<source>", content)
+        self.assertIs(coder.get_files_content(), content)
+
+        file1.write_text("changed\n")
+        content = coder.get_files_content()
+        self.assertIn("changed", content)
+        self.assertNotIn("one", content)
+
+    def test_live_incremental_response_throttled(self):
+        with GitTemporaryDirectory():
+            coder = Coder.create(models.GPT4, None, io=InputOutput())
+            coder.partial_response_content = "hello"
+            coder.render_incremental_response = MagicMock(return_value="hello")
+
+            mdstream = MagicMock()
+            mdstream.throttled.return_value = True
+
+            coder.live_incremental_response(mdstream, False)
+            coder.render_incremental_response.assert_not_called()
+            mdstream.update.assert_not_called()
+
+            # the final update is always rendered
+            coder.live_incremental_response(mdstream, True)
+            mdstream.update.assert_called_once_with("hello", final=True)
+
+    def test_show_send_output_stream(self):
+        with GitTemporaryDirectory():
+            coder = Coder.create(models.GPT4, None, io=InputOutput(pretty=False))
+            coder.partial_response_content = ""
+            coder.partial_response_function_call = dict()
+
+            def chunk(**delta):
+                return SimpleNamespace(
+                    choices=[SimpleNamespace(delta=SimpleNamespace(**delta), finish_reason=None)]
+                )
+
+            completion = [
+                chunk(role="assistant", content=None, function_call=None),
+                chunk(content="hello ", function_call=None),
+                chunk(function_call=dict(name="write_", arguments="{")),
+                chunk(function_call=dict(name="file", arguments="}")),
+                chunk(content="world"),
+                SimpleNamespace(choices=[]),
+            ]
+
+            with patch("sys.stdout"):
+                coder.show_send_output_stream(completion)
+
+            self.assertEqual(coder.partial_response_content, "hello world")
+            self.assertEqual(
+                coder.partial_response_function_call, dict(name="write_file", arguments="{}")
+            )
+
     def test_check_for_filename_mentions(self):
         with GitTemporaryDirectory():
             repo = git.Repo()
@@ -294,6 +379,21 @@ class TestCoder(unittest.TestCase):
 
         self.assertNotEqual(coder.fence[0], "```")
 
+    def test_fmt_system_prompt_follows_fence(self):
+        with GitTemporaryDirectory():
+            coder = Coder.create(models.GPT4, None, io=InputOutput())
+            prompt = coder.gpt_prompts.system_reminder
+
+            coder.fence = ("```", "```")
+            formatted = coder.fmt_system_prompt(prompt)
+            self.assertIs(coder.fmt_system_prompt(prompt), formatted)
+            self.assertIn("```", formatted)
+
+            coder.fence = ("<source>", "</source>")
+            formatted = coder.fmt_system_prompt(prompt)
+            self.assertIn("<source>", formatted)
+            self.assertNotIn("```", formatted)
+
     def test_run_with_file_utf_unicode_error(self):
         "make sure that we honor InputOutput(encoding) and don't just assume utf-8"
         # Create a few temporary files
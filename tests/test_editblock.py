@@ -61,6 +61,16 @@ class TestUtils(unittest.TestCase):
         result = eb.strip_quoted_wrapping(input_text)
         self.assertEqual(result, expected_output)
 
+    def test_strip_quoted_wrapping_crlf(self):
+        input_text = "filename.ext\r\n```\r\nWe just want this content\r\n\r\n```\r\n"
+        expected_output = "We just want this content\n"
+        result = eb.strip_quoted_wrapping(input_text, "filename.ext")
+        self.assertEqual(result, expected_output)
+
+    def test_strip_quoted_wrapping_only_filename(self):
+        self.assertEqual(eb.strip_quoted_wrapping("filename.ext\n", "filename.ext"), "")
+        self.assertEqual(eb.strip_quoted_wrapping("```\n```", "filename.ext"), "")
+
     def test_find_original_update_blocks(self):
         edit = """
 Here's the change:
@@ -194,6 +204,39 @@ aider/coder.py
         # Should not raise a ValueError
         list(eb.find_original_update_blocks(edit))
 
+    def test_find_original_update_blocks_back_to_back(self):
+        edit = """
+foo.txt
+<<<<<<< SEARCH
+one
+=======
+two
+>>>>>>> REPLACE
+<<<<<<< SEARCH
+three
+=======
+four
+>>>>>>> REPLACE
+"""
+
+        edits = list(eb.find_original_update_blocks(edit))
+        self.assertEqual(
+            edits,
+            [("foo.txt", "one\n", "two\n"), ("foo.txt", "three\n", "four\n")],
+        )
+
+    def test_find_original_update_blocks_unexpected_marker(self):
+        edit = """
+foo.txt
+<<<<<<< SEARCH
+one
+>>>>>>> REPLACE
+"""
+
+        with self.assertRaises(ValueError) as cm:
+            list(eb.find_original_update_blocks(edit))
+        self.assertIn("Expected `=======`", str(cm.exception))
+
     def test_incomplete_edit_block_missing_filename(self):
         edit = """
 No problem! Here are the changes to patch `subprocess.check_output` instead of `subprocess.run` in both tests:
@@ -240,6 +283,15 @@ These changes replace the `subprocess.run` patches with `subprocess.check_output
         self.assertEqual(edit_blocks[0][0], "tests/test_repomap.py")
         self.assertEqual(edit_blocks[1][0], "tests/test_repomap.py")
 
+    def test_replace_exact_match_is_line_aligned(self):
+        whole = "xline1\nline1\nline2\nline1\n"
+        part = "line1\n"
+        replace = "new_line1\n"
+        expected_output = "xline1\nnew_line1\nline2\nline1\n"
+
+        result = eb.replace_most_similar_chunk(whole, part, replace)
+        self.assertEqual(result, expected_output)
+
     def test_replace_part_with_missing_varied_leading_whitespace(self):
         whole = """
     line1
@@ -326,6 +378,49 @@ new
         content = Path(file1).read_text(encoding="utf-8")
         self.assertEqual(content, "one\nnew\nthree\n")
 
+    def test_full_edit_same_file_twice(self):
+        # Create a few temporary files
+        _, file1 = tempfile.mkstemp()
+
+        with open(file1, "w", encoding="utf-8") as f:
+            f.write("one\ntwo\nthree\n")
+
+        files = [file1]
+
+        io = InputOutput()
+        coder = Coder.create(models.GPT4, "diff", io=io, fnames=files)
+
+        def mock_send(*args, **kwargs):
+            coder.partial_response_content = f"""
+Do this:
+
+{Path(file1).name}
+<<<<<<< SEARCH
+one
+=======
+uno
+>>>>>>> REPLACE
+
+{Path(file1).name}
+<<<<<<< SEARCH
+three
+=======
+tres
+>>>>>>> REPLACE
+
+"""
+            coder.partial_response_function_call = dict()
+
+        coder.send = MagicMock(side_effect=mock_send)
+
+        # the second edit should use the content written by the first, not re-read it
+        with patch.object(io, "read_text", wraps=io.read_text) as mock_read:
+            coder.run(with_message="hi")
+            self.assertEqual(mock_read.call_count, 1)
+
+        content = Path(file1).read_text(encoding="utf-8")
+        self.assertEqual(content, "uno\ntwo\ntres\n")
+
     def test_full_edit_dry_run(self):
         # Create a few temporary files
         _, file1 = tempfile.mkstemp()
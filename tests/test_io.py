@@ -43,6 +43,30 @@ class TestInputOutput(unittest.TestCase):
             autocompleter = AutoCompleter(root, rel_fnames, addable_rel_fnames, commands, "utf-8")
             self.assertEqual(autocompleter.words, set(rel_fnames))
 
+    def test_chat_history_file(self):
+        with ChdirTemporaryDirectory():
+            io = InputOutput(chat_history_file="history.md")
+            io.tool_output("hello")
+            io.tool_error("oops")
+            io.flush_chat_history()
+
+            history = Path("history.md").read_text()
+            self.assertIn("# aider chat started at", history)
+            self.assertIn("> hello", history)
+            self.assertIn("> oops", history)
+
+    def test_chat_history_write_error(self):
+        with ChdirTemporaryDirectory():
+            io = InputOutput(chat_history_file="history.md", encoding="bogus-enc")
+
+            with self.assertRaises(LookupError):
+                io.flush_chat_history()
+
+            # the writer thread survives the failure
+            io.tool_output("hello")
+            with self.assertRaises(LookupError):
+                io.flush_chat_history()
+
 
 if __name__ == "__main__":
     unittest.main()
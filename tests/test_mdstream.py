@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import patch
+
+from aider.mdstream import MarkdownStream, _text
+
+
+class TestMarkdownStream(unittest.TestCase):
+    def setUp(self):
+        self.patcher = patch("aider.mdstream.Live")
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def check_incremental_render(self, text, step):
+        mdstream = MarkdownStream()
+        for i in range(0, len(text), step):
+            mdstream.freeze(text[:i])
+        mdstream.freeze(text)
+
+        lines = mdstream.frozen_lines + mdstream.render(text[mdstream.frozen_upto :])
+        self.assertEqual(lines, mdstream.render(text))
+        return mdstream
+
+    def test_incremental_render_matches_full_render(self):
+        text = 3 * _text
+        for step in (1, 7, 50):
+            mdstream = self.check_incremental_render(text, step)
+            self.assertGreater(mdstream.frozen_upto, 0)
+
+    def test_unchanged_text_is_not_rendered_again(self):
+        mdstream = MarkdownStream()
+        mdstream.min_delay = 0
+
+        with patch.object(mdstream, "render", wraps=mdstream.render) as mock:
+            mdstream.update("Hello *world*")
+            mdstream.update("Hello *world*")
+            self.assertEqual(mock.call_count, 1)
+
+            mdstream.update("Hello *world*, again", final=True)
+            self.assertEqual(mock.call_count, 2)
+
+    def test_no_split_inside_fence_or_list(self):
+        text = """Here are the changes:
+
+foo.py
+```python
+<<<<<<< SEARCH
+import os
+
+
+def f():
+    pass
+=======
+import sys
+>>>>>>> REPLACE
+```
+
+1. first
+
+2. second
+
+Para
+a | b
+--|--
+1 | 2
+
+The end.
+"""
+        for step in (1, 3, 20):
+            self.check_incremental_render(text, step)
+
+        mdstream = MarkdownStream()
+        self.assertEqual(mdstream.find_split(text), len(text) - len("The end.\n"))
+
+    def test_no_split_inside_nested_fences(self):
+        text = """Some docs:
+
+~~~markdown
+```
+
+Example one.
+
+Example two.
+~~~
+
+````
+```
+
+Inner one.
+
+Inner two.
+```
+````
+
+After.
+
+The end.
+"""
+        for step in (1, 3, 20):
+            self.check_incremental_render(text, step)
+
+        mdstream = MarkdownStream()
+        self.assertEqual(mdstream.find_split(text), len(text) - len("The end.\n"))
+
+    def test_indented_fence_does_not_close_fence(self):
+        text = '''Here is the file:
+
+new.py
+```python
+a = 1
+
+s = """
+    ```
+x = 1
+
+Plain line
+"""
+```
+
+Done.
+'''
+        for step in (1, 3, 20):
+            self.check_incremental_render(text, step)
+
+        mdstream = MarkdownStream()
+        self.assertEqual(mdstream.find_split(text), len("Here is the file:\n\n"))
+
+    def test_no_split_inside_pre_block(self):
+        text = """docs/notes.md
+<pre>
+<<<<<<< SEARCH
+Install it like this
+
+Then run it
+=======
+Install it like that
+
+Then run it again
+>>>>>>> REPLACE
+</pre>
+
+After.
+
+The end.
+"""
+        for step in (1, 3, 20):
+            self.check_incremental_render(text, step)
+
+        mdstream = MarkdownStream()
+        self.assertEqual(mdstream.find_split(text), len(text) - len("The end.\n"))
+
+    def test_changed_text_is_refrozen(self):
+        mdstream = MarkdownStream()
+        mdstream.freeze("First para.\n\nSecond para.\n\nThird")
+        self.assertGreater(mdstream.frozen_upto, 0)
+
+        text = "Other para.\n\nMore text.\n\nEnd"
+        mdstream.freeze(text)
+        self.assertTrue(text.startswith(mdstream.frozen_text))
+
+        lines = mdstream.frozen_lines + mdstream.render(text[mdstream.frozen_upto :])
+        self.assertEqual(lines, mdstream.render(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,6 +53,44 @@ class TestRepo(unittest.TestCase):
             self.assertIn("index", diffs)
             self.assertIn("workingdir", diffs)
 
+    def test_diffs_detached_head(self):
+        with GitTemporaryDirectory():
+            repo = git.Repo()
+            fname = Path("foo.txt")
+            fname.write_text("one\n")
+            repo.git.add(str(fname))
+            repo.git.commit("-m", "initial")
+            repo.git.checkout("--detach")
+
+            fname.write_text("two\n")
+
+            git_repo = GitRepo(InputOutput(), None, ".")
+            diffs = git_repo.get_diffs([str(fname)])
+            self.assertIn("+two", diffs)
+            self.assertIn("-one", diffs)
+
+    def test_diffs_lists_added_files(self):
+        with GitTemporaryDirectory():
+            repo = git.Repo()
+            fname = Path("foo.txt")
+            fname.write_text("one\n")
+            repo.git.add(str(fname))
+            repo.git.commit("-m", "initial")
+
+            fname.write_text("two\n")
+            fname2 = Path("bar.txt")
+            fname2.write_text("new\n")
+
+            git_repo = GitRepo(InputOutput(), None, ".")
+            with patch.object(
+                git_repo, "get_tracked_files", wraps=git_repo.get_tracked_files
+            ) as mock:
+                diffs = git_repo.get_diffs([str(fname), str(fname2)])
+
+            self.assertIn("Added bar.txt", diffs)
+            self.assertNotIn("Added foo.txt", diffs)
+            self.assertEqual(mock.call_count, 1)
+
     def test_diffs_between_commits(self):
         with GitTemporaryDirectory():
             repo = git.Repo()
@@ -243,6 +281,21 @@ class TestRepo(unittest.TestCase):
             fnames = git_repo.get_tracked_files()
             self.assertIn(str(fname), fnames)
 
+    def test_repo_lookup_once_per_dir(self):
+        with GitTemporaryDirectory():
+            fnames = []
+            for name in ("one.txt", "two.txt", "three.txt"):
+                fname = Path(name)
+                fname.touch()
+                fnames.append(str(fname))
+
+            with patch.object(git, "Repo", wraps=git.Repo) as mock_repo:
+                git_repo = GitRepo(InputOutput(), fnames, None)
+
+            # one search for the shared dir, plus opening the repo itself
+            self.assertEqual(mock_repo.call_count, 2)
+            self.assertEqual(git_repo.root, str(Path.cwd().resolve()))
+
     @patch("aider.repo.simple_send_with_retries")
     def test_noop_commit(self, mock_send):
         mock_send.return_value = '"a good commit message"'
@@ -260,3 +313,49 @@ class TestRepo(unittest.TestCase):
             git_repo = GitRepo(InputOutput(), None, None)
 
             git_repo.commit(fnames=[str(fname)])
+
+    def test_commit_clean_repo(self):
+        with GitTemporaryDirectory():
+            raw_repo = git.Repo()
+
+            fname = Path("file.txt")
+            fname.write_text("one\n")
+            raw_repo.git.add(str(fname))
+            raw_repo.git.commit("-m", "initial")
+
+            git_repo = GitRepo(InputOutput(), None, None)
+            with patch.object(git_repo, "get_commit_message") as mock:
+                self.assertIsNone(git_repo.commit())
+                mock.assert_not_called()
+
+            fname.write_text("two\n")
+            res = git_repo.commit(message="dirty")
+            self.assertEqual(res[1], "dirty")
+            self.assertFalse(raw_repo.is_dirty())
+
+    def test_commit_new_and_changed_files(self):
+        with GitTemporaryDirectory():
+            raw_repo = git.Repo()
+
+            fname = Path("file.txt")
+            fname.write_text("one\n")
+            raw_repo.git.add(str(fname))
+            raw_repo.git.commit("-m", "initial")
+
+            fname.write_text("two\n")
+            fname2 = Path("new.txt")
+            fname2.write_text("new\n")
+
+            git_repo = GitRepo(InputOutput(), None, None)
+            # Git has __slots__, so patch the class with a wrapper around a real `git add`
+            git_add = raw_repo.git.add
+            with patch.object(git.cmd.Git, "add", wraps=git_add, create=True) as mock_add:
+                git_repo.commit(fnames=[str(fname), str(fname2)], message="both files")
+
+            # both files are staged by a single `git add`
+            mock_add.assert_called_once_with("--", str(fname.resolve()), str(fname2.resolve()))
+
+            self.assertFalse(raw_repo.is_dirty(untracked_files=True))
+            self.assertEqual(raw_repo.head.commit.message.strip(), "both files")
+            changed = set(raw_repo.head.commit.stats.files)
+            self.assertEqual(changed, {"file.txt", "new.txt"})